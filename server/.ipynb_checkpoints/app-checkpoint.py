@@ -1,12 +1,13 @@
+import sys
 from flask import Flask, request, render_template, jsonify
-import joblib
-import pandas as pd
 import json
 import re
 import subprocess
 import tempfile
 from pathlib import Path
-from sklearn.metrics.pairwise import cosine_similarity
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from utils.loader import get_corpus, get_vectorizer, get_tfidf_matrix
 
 app = Flask(__name__, template_folder="templates")
 
@@ -15,11 +16,11 @@ app = Flask(__name__, template_folder="templates")
 # --------------------------------------------------------------------
 BASE_DIR = Path(__file__).resolve().parents[1]
 DATA_DIR = BASE_DIR / "data"
-MODELS_DIR = BASE_DIR / "models"
 
-# Load model and data
-vectorizer = joblib.load(MODELS_DIR / "tfidf_vectorizer.pkl")
-corpus = pd.read_csv(DATA_DIR / "corpus_java.csv")
+# Load model and data (shared, memoized loaders)
+vectorizer = get_vectorizer()
+corpus = get_corpus()
+TFIDF_MATRIX = get_tfidf_matrix()
 
 with open(DATA_DIR / "common_java_errors.json") as f:
     ERROR_PATTERNS = json.load(f)
@@ -27,23 +28,24 @@ with open(DATA_DIR / "common_java_errors.json") as f:
 # --------------------------------------------------------------------
 # HELPER FUNCTIONS
 # --------------------------------------------------------------------
+GREETINGS = frozenset({"hi", "hello", "hey", "hola", "good morning", "good evening"})
+
 def is_greeting(text):
     """Check if user said hello / hi / hey."""
-    greetings = ["hi", "hello", "hey", "hola", "good morning", "good evening"]
-    return text.lower().strip() in greetings
+    return text.lower().strip() in GREETINGS
+
+JAVA_HINT_RE = re.compile(r'class |System\.out\.println|public static void main|;|import java')
 
 def is_java_code(text):
     """Detect if user input looks like Java code."""
-    indicators = ["class ", "System.out.println", "public static void main", ";", "import java"]
-    score = sum(1 for token in indicators if token in text)
-    return score >= 1 and ("{" in text or "\n" in text)
+    return JAVA_HINT_RE.search(text) is not None and ("{" in text or "\n" in text)
 
 def retrieve_answer(query):
     """Retrieve best Java answer from corpus."""
-    q_vec = vectorizer.transform([query])
-    sims = cosine_similarity(q_vec, vectorizer.transform(corpus["question"])).flatten()
-    top_idx = sims.argsort()[::-1][0]
-    return corpus.iloc[top_idx]["answer"], sims[top_idx]
+    q_vec = vectorizer.transform([query]).astype(TFIDF_MATRIX.dtype)
+    sims = (TFIDF_MATRIX @ q_vec.T).toarray().ravel()
+    top_idx = int(sims.argmax())
+    return corpus["answer"][top_idx], sims[top_idx]
 
 def compile_java(code):
     """Compile the given Java code temporarily and capture errors."""
@@ -1,3 +1,4 @@
+import re
 import sys
 from pathlib import Path
 
@@ -5,46 +6,56 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 
 from flask import Flask, request, jsonify
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
 
-import joblib
-import pandas as pd
+import orjson
 
-from utils.retrieval import retrieve_answer
+from utils.loader import get_corpus, get_vectorizer, get_tfidf_matrix
+from utils.retrieval import make_retriever
 from utils.code_analyzer import analyze_java_code
 
 # --------------------------------------------------
 # APP SETUP
 # --------------------------------------------------
+class OrjsonProvider(JSONProvider):
+    """Request/response JSON through orjson (C serializer, emits bytes)"""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj), mimetype="application/json")
+
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 CORS(app)  # 🔥 REQUIRED for Web Components
 
-BASE_DIR = Path(__file__).resolve().parent
-DATA_DIR = BASE_DIR.parent / "data"
-MODELS_DIR = BASE_DIR.parent / "models"
-
 # --------------------------------------------------
 # LOAD MODELS & DATA
 # --------------------------------------------------
-corpus = pd.read_csv(DATA_DIR / "corpus_java.csv")
+corpus = get_corpus()
+vectorizer = get_vectorizer()
+tfidf_matrix = get_tfidf_matrix()
 
-vectorizer = joblib.load(MODELS_DIR / "tfidf_vectorizer.pkl")
-tfidf_matrix = vectorizer.transform(
-    corpus["question"].fillna("").tolist()
-)
+retrieve = make_retriever(vectorizer, tfidf_matrix, corpus)
 
 # --------------------------------------------------
 # HELPERS
 # --------------------------------------------------
+_CODE_HINT_RE = re.compile(
+    r'class |public static void main|System\.out\.println|[{};]'
+)
+
+
 def looks_like_code(text: str) -> bool:
     """Detect if input resembles Java code"""
-    patterns = [
-        "class ",
-        "public static void main",
-        "System.out.println",
-        "{", "}", ";"
-    ]
-    return len(text) > 30 and any(p in text for p in patterns)
+    return len(text) > 30 and _CODE_HINT_RE.search(text) is not None
 
 # --------------------------------------------------
 # API ROUTES
@@ -81,13 +92,7 @@ def api_query():
     # --------------------------------------------------
     # QUESTION / ANSWER MODE
     # --------------------------------------------------
-    results = retrieve_answer(
-        vectorizer,
-        tfidf_matrix,
-        corpus,
-        text,
-        k=1
-    )
+    results = retrieve(text, k=1)
 
     if results and results[0]["score"] >= 0.3:
         return jsonify({
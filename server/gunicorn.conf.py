@@ -0,0 +1,13 @@
+import os
+
+# Load the vectorizer, corpus and TF-IDF matrix once in the master process;
+# forked workers share those pages copy-on-write instead of each reloading them.
+preload_app = True
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", "2"))
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", "8"))
+
+# Code analysis can spend up to ~5s running the user's program
+timeout = 30
@@ -0,0 +1,8 @@
+"""
+WSGI entry point for production servers.
+
+    cd server && gunicorn wsgi:app
+
+gunicorn picks up gunicorn.conf.py from the working directory.
+"""
+from app import app
@@ -76,6 +76,85 @@ def test_pattern_matching():
                 print(f"✅ Pattern '{error_key}' matched correctly")
 
 
+def test_parse_javac_output_best_root_cause():
+    """Test that the javac parser returns the single highest-scoring match"""
+    from utils.code_analyzer import parse_javac_output
+
+    output = (
+        "Main.java:3: error: ';' expected\n"
+        "        int x = 10\n"
+        "                  ^\n"
+        "1 error\n"
+    )
+    result = parse_javac_output(output)
+
+    assert len(result) == 1
+    assert result[0]["id"] == "missing_semicolon"
+    assert result[0]["detail"] == "';' expected"
+
+    # Unknown errors fall back to a generic compile error
+    fallback = parse_javac_output("Main.java:3: error: something weird happened\n")
+    assert fallback[0]["id"] == "unknown_compile_error"
+
+    assert parse_javac_output("") == []
+
+
+def test_required_literal_anchors():
+    """Test the literal anchors that gate javac pattern regexes"""
+    from utils.code_analyzer import _required_literal
+
+    # Escaped metachar stays literal
+    assert _required_literal(r"'\\]' expected") == "'\\]' expected"
+    # Longest literal run around a wildcard
+    assert _required_literal("modifier .* not allowed here") == " not allowed here"
+    # \s is a class, not a literal
+    assert _required_literal(r"cannot find symbol\s*symbol:\s*class") == "cannot find symbol"
+    # A quantified char is optional and must not be part of the anchor
+    assert _required_literal("colou?r mismatch") == "r mismatch"
+    # Anchors are lowercase
+    assert _required_literal("NullPointerException") == "nullpointerexception"
+    # Groups and alternation are not analysed
+    assert _required_literal("modifier (public|private) not allowed here") == ""
+    assert _required_literal("'while' expected|'for' expected") == ""
+    # Escapes whose payload is not literal text are not analysed
+    assert _required_literal(r"\x41BC") == ""
+    assert _required_literal(r"\u0041BC") == ""
+    assert _required_literal(r"\U00000041BC") == ""
+    assert _required_literal(r"\N{LATIN CAPITAL LETTER A}BC") == ""
+    assert _required_literal(r"\0101BC") == ""
+    assert _required_literal(r"ab\1234") == ""
+
+
+def test_parse_javac_output_anchor_gate_is_exact():
+    """Test that the anchor gate never changes the parse result"""
+    import utils.code_analyzer as analyzer
+
+    outputs = [
+        "Main.java:3: ERROR: Cannot Find Symbol\n  Symbol:   CLASS Foo\n",
+        "Main.java:2: error: Modifier PRIVATE Not Allowed Here\n",
+        "Main.java:5: error: ']' EXPECTED\n",
+        "Main.java:4: error: Incompatible Types: String cannot be CONVERTED to int\n",
+        "Maïn.java:3: error: CANNOT FIND SYMBOL\n",
+        "Main.java:1: error: nothing we know about\n",
+    ]
+
+    gated = analyzer._error_patterns()
+    analyzer._parse_javac_output_cached.cache_clear()
+    with_gate = [analyzer.parse_javac_output(out) for out in outputs]
+
+    original = analyzer._error_patterns
+    analyzer._error_patterns = lambda: [entry[:6] + ("",) for entry in gated]
+    analyzer._parse_javac_output_cached.cache_clear()
+    try:
+        without_gate = [analyzer.parse_javac_output(out) for out in outputs]
+    finally:
+        analyzer._error_patterns = original
+        analyzer._parse_javac_output_cached.cache_clear()
+
+    assert with_gate == without_gate
+    assert with_gate[0][0]["id"] != "unknown_compile_error"
+
+
 if __name__ == "__main__":
     # Run tests
     print("Running error pattern tests...\n")
@@ -87,6 +166,12 @@ if __name__ == "__main__":
         print("\n" + "="*50)
         test_pattern_matching()
         print("\n" + "="*50)
+        test_parse_javac_output_best_root_cause()
+        print("\n" + "="*50)
+        test_required_literal_anchors()
+        print("\n" + "="*50)
+        test_parse_javac_output_anchor_gate_is_exact()
+        print("\n" + "="*50)
         print("\n✅ All tests passed!")
     except AssertionError as e:
         print(f"\n❌ Test failed: {e}")
@@ -0,0 +1,84 @@
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import string
+import subprocess
+import time
+import pytest
+
+from utils.code_analyzer import MAX_RUNTIME_OUTPUT, _cap_output, run_program
+
+
+def _writer(n):
+    """argv for a child that writes n bytes of varied ASCII to stdout"""
+    code = (
+        "import sys, string\n"
+        "data = (string.ascii_letters * ({n} // 52 + 1))[:{n}]\n"
+        "sys.stdout.buffer.write(data.encode())\n"
+    ).format(n=n)
+    return [sys.executable, "-c", code]
+
+
+def _expected(n):
+    """The full stream of _writer(n), capped in one go"""
+    data = (string.ascii_letters * (n // 52 + 1))[:n]
+    return _cap_output(data.encode())
+
+
+def test_run_program_matches_cap_output():
+    """Test that the bounded reader returns what _cap_output gives for the full stream"""
+    limit = MAX_RUNTIME_OUTPUT
+    for n in (0, limit, limit + 1, 3 * 1024 * 1024):
+        assert run_program(_writer(n), timeout=10) == _expected(n), n
+
+
+def test_run_program_merges_stderr():
+    """Test that stderr shows up in the returned output"""
+    code = (
+        "import sys\n"
+        "print('to stdout', flush=True)\n"
+        "print('to stderr', file=sys.stderr, flush=True)\n"
+    )
+    output = run_program([sys.executable, "-c", code], timeout=10)
+    assert output == "to stdout\nto stderr\n"
+
+
+def test_run_program_print_loop_times_out():
+    """Test that a program printing forever is killed at the deadline"""
+    code = "while True:\n    print('spam')\n"
+    start = time.monotonic()
+    with pytest.raises(subprocess.TimeoutExpired):
+        run_program([sys.executable, "-c", code], timeout=1)
+    assert time.monotonic() - start < 5
+
+
+def test_run_program_closed_output_times_out():
+    """Test that a program closing its output and then hanging still times out"""
+    code = "import os, time\nos.close(1)\nos.close(2)\ntime.sleep(30)\n"
+    start = time.monotonic()
+    with pytest.raises(subprocess.TimeoutExpired):
+        run_program([sys.executable, "-c", code], timeout=1)
+    assert time.monotonic() - start < 5
+
+
+if __name__ == "__main__":
+    # Run tests
+    print("Running run_program tests...\n")
+
+    try:
+        test_run_program_matches_cap_output()
+        print("\n" + "="*50)
+        test_run_program_merges_stderr()
+        print("\n" + "="*50)
+        test_run_program_print_loop_times_out()
+        print("\n" + "="*50)
+        test_run_program_closed_output_times_out()
+        print("\n" + "="*50)
+        print("\n✅ All tests passed!")
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+    except Exception as e:
+        print(f"\n❌ Error running tests: {e}")
@@ -1,7 +1,9 @@
 # This file marks the utils directory as a Python package
 # It can be empty or contain package-level imports
 
-from .retrieval import retrieve_answer, load_corpus, load_vectorizer
+from .retrieval import retrieve_answer, make_retriever, load_corpus, load_vectorizer
 from .code_analyzer import analyze_java_code
+from .loader import get_corpus, get_vectorizer, get_tfidf_matrix
 
-__all__ = ['retrieve_answer', 'load_corpus', 'load_vectorizer', 'analyze_java_code']
\ No newline at end of file
+__all__ = ['retrieve_answer', 'make_retriever', 'load_corpus', 'load_vectorizer', 'analyze_java_code',
+           'get_corpus', 'get_vectorizer', 'get_tfidf_matrix']
\ No newline at end of file
@@ -1,9 +1,24 @@
+import os
 import re
 import json
+import queue
+import selectors
+import hashlib
+import atexit
+import shutil
 import tempfile
+import threading
+import time
 import subprocess
 from pathlib import Path
-from typing import List, Dict
+from functools import lru_cache
+from collections import OrderedDict
+from typing import Callable, List, Dict, Tuple, Optional
+
+try:
+    import orjson
+except ImportError:  # plain json works, just slower
+    orjson = None
 
 # =========================================================
 # LOAD ERROR PATTERNS
@@ -11,292 +26,834 @@ from typing import List, Dict
 
 ERRORS_PATH = Path(__file__).resolve().parent.parent / "data" / "common_java_errors.json"
 
-with open(ERRORS_PATH, "r", encoding="utf-8") as f:
-    ERROR_PATTERNS = json.load(f)
+
+_REGEX_METACHARS = set(".^$*+?{}[]\\|()")
+_MAX_BONUS = 500 + 200 + 150
+
+
+def _score_bonus(text: str) -> int:
+    """Extra weight for matches that point at a syntax killer"""
+    lowered = text.lower()
+    bonus = 0
+    if "';'" in text:
+        bonus += 500
+    if "expected" in lowered:
+        bonus += 200
+    if "illegal start" in lowered:
+        bonus += 150
+    return bonus
+
+
+def _required_literal(pattern: str) -> str:
+    """
+    Longest lowercase ASCII run every match of pattern must contain, or ''
+    when that cannot be told cheaply (groups, classes, alternation...).
+    """
+    if any(c in pattern for c in "([{|"):
+        return ""
+    best = run = ""
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c == "\\" and i + 1 < len(pattern):
+            nxt = pattern[i + 1]
+            i += 2
+            if nxt in "xuUN" or nxt.isdigit():  # payload is not literal text
+                return ""
+            if nxt.isalnum() or not nxt.isascii():  # \s, \d, \b, ...
+                best, run = max(best, run, key=len), ""
+            else:
+                run += nxt
+            continue
+        i += 1
+        if c in "*?+":
+            run = run[:-1]  # the quantified char is optional
+            best, run = max(best, run, key=len), ""
+        elif c in ".^$" or not c.isascii():
+            best, run = max(best, run, key=len), ""
+        else:
+            run += c
+    return max(best, run, key=len).lower()
+
+
+def _compile_error_patterns(patterns: Dict[str, Dict]) -> List[Tuple]:
+    """
+    Compile every non-empty pattern once as
+    (order, key, regex, info, base_score, max_score, anchor).
+
+    Invalid regexes are dropped here instead of on every parse, and a
+    pattern shared by several keys is scanned only for the first of them
+    (the others could never win a tie in parse_javac_output).
+
+    max_score is the best score the pattern can ever reach: exact for plain
+    literals, base + every bonus otherwise. Entries are sorted by it so the
+    parser can stop once nothing left can beat the current match.
+
+    anchor is a literal the output must contain for the regex to match.
+    """
+    compiled = []
+    seen_patterns = set()
+    for order, (key, info) in enumerate(patterns.items()):
+        pattern = info.get("pattern")
+        if not pattern or pattern in seen_patterns:
+            continue
+        seen_patterns.add(pattern)
+        try:
+            regex = re.compile(pattern, re.IGNORECASE | re.MULTILINE)
+        except re.error:
+            continue
+
+        base_score = len(pattern) * 5
+        if _REGEX_METACHARS.isdisjoint(pattern):
+            max_score = base_score + _score_bonus(pattern)
+        else:
+            max_score = base_score + _MAX_BONUS
+        anchor = _required_literal(pattern)
+        compiled.append((order, key, regex, info, base_score, max_score, anchor))
+
+    compiled.sort(key=lambda entry: (-entry[5], entry[0]))
+    return compiled
+
+
+@lru_cache(maxsize=1)
+def _error_patterns() -> List[Tuple]:
+    """Read and compile ERRORS_PATH on the first parse, not at import"""
+    raw = ERRORS_PATH.read_bytes()
+    patterns = orjson.loads(raw) if orjson else json.loads(raw)
+    return _compile_error_patterns(patterns)
 
 # =========================================================
 # JAVAC OUTPUT PARSER (SINGLE BEST ROOT CAUSE)
 # =========================================================
 
+_RE_ONLY_SPACE_LEFT = re.compile(r'\s*\Z')
+
+
+def _strip_head(text: str, limit: int) -> str:
+    """text.strip()[:limit] without copying the whole of a long text"""
+    text = text.lstrip()
+    head = text[:limit]
+    if _RE_ONLY_SPACE_LEFT.match(text, limit):
+        head = head.rstrip()
+    return head
+
+
 def parse_javac_output(output: str) -> List[Dict[str, str]]:
     """
     Parse javac errors and return ONE best root-cause suggestion
     """
-    best_match = None
+    return [dict(issue) for issue in _parse_javac_output_cached(output)]
+
+
+@lru_cache(maxsize=128)
+def _parse_javac_output_cached(output: str) -> Tuple[Dict[str, str], ...]:
+    # Cached compiles replay byte-identical output, e.g. for sources the
+    # result memo skips; callers get copies so the cached dicts stay intact
+    best = None
     best_score = -1
+    best_order = -1
 
-    for key, info in ERROR_PATTERNS.items():
-        pattern = info.get("pattern")
-        if not pattern:
+    # Anchors are ASCII; for ASCII output lower() agrees with IGNORECASE
+    lowered = output.lower() if output.isascii() else None
+
+    for order, key, regex, info, base_score, max_score, anchor in _error_patterns():
+        # Sorted by max_score: nothing left can beat (or tie) the best match
+        if max_score < best_score:
+            break
+
+        # Cheap substring miss instead of a regex scan
+        if anchor and lowered is not None and anchor not in lowered:
             continue
 
-        try:
-            regex = re.compile(pattern, re.IGNORECASE | re.MULTILINE)
-            match = regex.search(output)
-            if match:
-                # Strong scoring logic
-                score = 0
-                score += len(pattern) * 5
-
-                # Prioritize syntax killers
-                if "';'" in match.group(0):
-                    score += 500
-                if "expected" in match.group(0).lower():
-                    score += 200
-                if "illegal start" in match.group(0).lower():
-                    score += 150
-
-                if score > best_score:
-                    best_score = score
-                    best_match = {
-                        "id": key,
-                        "title": info["title"],
-                        "explanation": info["explanation"],
-                        "fix_example": info.get("fix_example", ""),
-                        "detail": match.group(0).strip()
-                    }
-        except re.error:
+        match = regex.search(output)
+        if not match:
             continue
 
-    if best_match:
-        return [best_match]
+        # Strong scoring logic, prioritizing syntax killers
+        text = match.group(0)
+        score = base_score + _score_bonus(text)
+
+        # Ties go to the pattern listed first in the JSON file
+        if score > best_score or (score == best_score and order < best_order):
+            best_score = score
+            best_order = order
+            best = (key, info, text)
+
+    if best:
+        key, info, text = best
+        return ({
+            "id": key,
+            "title": info["title"],
+            "explanation": info["explanation"],
+            "fix_example": info.get("fix_example", ""),
+            "detail": text.strip()
+        },)
 
     # Fallback
-    if output.strip():
-        return [{
+    detail = _strip_head(output, 500)
+    if detail:
+        return ({
             "id": "unknown_compile_error",
             "title": "❌ Compile Error",
             "explanation": "The compiler reported an error that didn't match known patterns.",
             "fix_example": "Check syntax carefully near the highlighted line.",
-            "detail": output.strip()[:500]
-        }]
+            "detail": detail
+        },)
 
-    return []
+    return ()
 
 # =========================================================
 # PUBLIC CLASS NAME DETECTOR
 # =========================================================
 
+# One pass finds both forms; a "public" prefix wins over an earlier plain class.
+# The name is a lookahead so a match never swallows a following "public".
+_RE_CLASS = re.compile(r'(public\s+)?class\s+(?=([A-Za-z_]\w*))')
+
+
 def find_public_class_name(code: str) -> str:
-    m = re.search(r'public\s+class\s+([A-Za-z_]\w*)', code)
-    if m:
-        return m.group(1)
-    m = re.search(r'class\s+([A-Za-z_]\w*)', code)
-    return m.group(1) if m else "Main"
+    # The pattern needs the keyword; bare snippets skip the regex scan
+    if "class" not in code:
+        return "Main"
+    first = None
+    for m in _RE_CLASS.finditer(code):
+        if m.group(1):
+            return m.group(2)
+        if first is None:
+            first = m.group(2)
+    return first or "Main"
 
 # =========================================================
 # CODE SMELLS (ONLY WHEN CODE COMPILES)
 # =========================================================
 
-def detect_code_smells(code: str) -> List[Dict[str, str]]:
-    issues = []
+# Smell rules only look at this much source; bounds worst-case regex time
+MAX_SMELL_SCAN = 200_000
+
+# (compiled pattern, issue) pairs, built once at import
+_SMELL_RULES = [
+    (re.compile(r'while\s*\(\s*true\s*\)'), {
+        "id": "infinite_loop",
+        "title": "🔄 Infinite Loop",
+        "explanation": "This loop runs forever unless explicitly stopped.",
+        "fix_example": "Add a proper condition or a break statement.",
+        "detail": "Detected while(true)"
+    }),
+]
 
-    if re.search(r'while\s*\(\s*true\s*\)', code):
-        issues.append({
-            "id": "infinite_loop",
-            "title": "🔄 Infinite Loop",
-            "explanation": "This loop runs forever unless explicitly stopped.",
-            "fix_example": "Add a proper condition or a break statement.",
-            "detail": "Detected while(true)"
-        })
 
-    return issues
+def detect_code_smells(code: str) -> List[Dict[str, str]]:
+    return [issue for rx, issue in _SMELL_RULES if rx.search(code, 0, MAX_SMELL_SCAN)]
 
 # =========================================================
 # RUNTIME ERROR ANALYZER (SEPARATE LOGIC)
 # =========================================================
 
+_RE_EXCEPTION = re.compile(r'Exception in thread.*?(\w+Exception)')
+
+
 def analyze_runtime_output(output: str) -> List[Dict[str, str]]:
-    exception = re.search(r'Exception in thread.*?(\w+Exception)', output)
+    # Most runs print no stack trace; a substring probe settles that fast
+    if "Exception in thread" not in output:
+        return []
+    exception = _RE_EXCEPTION.search(output)
     if exception:
+        # Slice the first line instead of splitting the whole output
+        nl = output.find("\n")
+        first_line = output if nl == -1 else output[:nl]
         return [{
             "id": "runtime_exception",
             "title": f"🔴 {exception.group(1)}",
             "explanation": "A runtime exception occurred during execution.",
             "fix_example": "Check the stack trace and fix the failing line.",
-            "detail": output.splitlines()[0]
+            "detail": first_line.rstrip("\r")
         }]
     return []
 
+# =========================================================
+# RESIDENT JAVAC (AMORTIZE JVM STARTUP)
+# =========================================================
+
+# Resolved once; PATH does not change under a running server
+_JAVAC = shutil.which("javac")
+_JAVA = shutil.which("java")
+
+# Compiler launches are trusted and Python's own fds are non-inheritable,
+# so they pass close_fds=False, which lets CPython spawn them with
+# posix_spawn. The user program keeps the default close_fds=True.
+
+DAEMON_SOURCE = Path(__file__).resolve().parent / "java" / "CompilerDaemon.java"
+DAEMON_POOL_SIZE = min(4, os.cpu_count() or 1)
+
+# Small heaps and the serial GC start faster and are plenty for one snippet
+COMPILER_JVM_FLAGS = ["-Xmx128m", "-XX:+UseSerialGC"]
+# User programs live for milliseconds: C1 only, shared JDK class archive
+RUNTIME_JVM_FLAGS = [
+    "-Xmx64m", "-XX:+UseSerialGC", "-Xss256k",
+    "-XX:TieredStopAtLevel=1", "-Xshare:auto",
+]
+MAX_RUNTIME_OUTPUT = 8192
+
+# Only the first diagnostic is explained; stop javac from reporting thousands.
+# No annotation processor discovery or implicit sources. Debug info stays on
+# so user stack traces keep their line numbers.
+JAVAC_FLAGS = [
+    "-proc:none", "-implicit:none", "-nowarn",
+    "-Xmaxerrs", "20", "-Xmaxwarns", "20",
+]
+MAX_COMPILE_OUTPUT = 65536
+
+# Keep .java/.class scratch files on tmpfs when the host provides one
+SCRATCH_ROOT = (
+    "/dev/shm"
+    if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK)
+    else tempfile.gettempdir()
+)
+
+# User programs are CPU-bound JVMs; queue them instead of oversubscribing
+_run_slots = threading.BoundedSemaphore(os.cpu_count() or 1)
+
+_daemon_lock = threading.Lock()
+_daemon_state = {
+    "pid": None,
+    "workdir": None,
+    "pool": None,
+    "classes": None,
+    "started": 0,
+    "disabled": False,
+}
+
+
+def _cleanup_workdir(workdir: Path, owner: int) -> None:
+    # Forked workers inherit atexit hooks; only the creator removes the dir
+    if os.getpid() == owner:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def _workdir() -> Path:
+    """
+    Long-lived per-process scratch directory under SCRATCH_ROOT.
+    State is reset after a fork so workers never share daemons.
+    """
+    with _daemon_lock:
+        if _daemon_state["pid"] != os.getpid():
+            owner = os.getpid()
+            workdir = Path(tempfile.mkdtemp(prefix="java_chatbot_", dir=SCRATCH_ROOT))
+            atexit.register(_cleanup_workdir, workdir, owner)
+            _daemon_state.update(
+                pid=owner,
+                workdir=workdir,
+                pool=queue.Queue(),
+                classes=None,
+                started=0
+            )
+        return _daemon_state["workdir"]
+
+
+def _daemon_classes() -> Optional[Path]:
+    """Compile CompilerDaemon.java once per process; None if that fails"""
+    workdir = _workdir()
+    with _daemon_lock:
+        if _daemon_state["disabled"]:
+            return None
+        if _daemon_state["classes"] is None:
+            out_dir = workdir / "daemon"
+            out_dir.mkdir(exist_ok=True)
+            proc = subprocess.run(
+                [_JAVAC, "-d", str(out_dir), str(DAEMON_SOURCE)],
+                capture_output=True,
+                close_fds=False
+            )
+            if proc.returncode != 0:
+                _daemon_state["disabled"] = True
+                return None
+            _daemon_state["classes"] = out_dir
+        return _daemon_state["classes"]
+
+
+def _acquire_daemon() -> Optional[subprocess.Popen]:
+    """Take an idle daemon, start one if the pool has room, else None"""
+    classes = _daemon_classes()
+    if classes is None:
+        return None
+
+    try:
+        return _daemon_state["pool"].get_nowait()
+    except queue.Empty:
+        pass
+
+    with _daemon_lock:
+        if _daemon_state["started"] >= DAEMON_POOL_SIZE:
+            return None
+        _daemon_state["started"] += 1
+
+    try:
+        return subprocess.Popen(
+            [_JAVA, *COMPILER_JVM_FLAGS, "-cp", str(classes), "CompilerDaemon"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            close_fds=False
+        )
+    except OSError:
+        with _daemon_lock:
+            _daemon_state["started"] -= 1
+            _daemon_state["disabled"] = True
+        return None
+
+
+def _release_daemon(proc: subprocess.Popen, healthy: bool) -> None:
+    if healthy:
+        _daemon_state["pool"].put(proc)
+        return
+    proc.kill()
+    proc.wait()
+    with _daemon_lock:
+        _daemon_state["started"] -= 1
+
+
+def _daemon_send(proc: subprocess.Popen, args: List[str]) -> None:
+    proc.stdin.write(("\t".join(args) + "\n").encode("utf-8"))
+    proc.stdin.flush()
+
+
+def _daemon_receive(proc: subprocess.Popen) -> Tuple[int, bytes]:
+    header = proc.stdout.readline()
+    if not header:
+        raise OSError("compiler daemon exited")
+    returncode, length = map(int, header.split())
+    body = proc.stdout.read(length)
+    if len(body) != length:
+        raise OSError("compiler daemon exited mid-response")
+    return returncode, body
+
+
+def _start_javac_subprocess(args: List[str]) -> Callable[[], Tuple[int, bytes]]:
+    compile_proc = subprocess.Popen(
+        [_JAVAC, *[f"-J{flag}" for flag in COMPILER_JVM_FLAGS], *args],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        close_fds=False
+    )
+
+    def finish() -> Tuple[int, bytes]:
+        output, _ = compile_proc.communicate()
+        return compile_proc.returncode, output
+
+    return finish
+
+
+def start_javac(java_file: Path) -> Callable[[], Tuple[int, bytes]]:
+    """
+    Start compiling one source file and return a callable that waits for
+    (returncode, raw javac output), so the caller can do other work meanwhile.
+    Uses a pooled resident javac when possible and falls back to a plain
+    javac subprocess when the pool is busy or the daemon is unavailable.
+    """
+    args = [*JAVAC_FLAGS, "-cp", str(java_file.parent), str(java_file)]
+
+    proc = _acquire_daemon()
+    if proc is not None:
+        try:
+            _daemon_send(proc, args)
+        except OSError:
+            _release_daemon(proc, healthy=False)
+        else:
+            def finish_daemon() -> Tuple[int, bytes]:
+                try:
+                    result = _daemon_receive(proc)
+                except (OSError, ValueError):
+                    _release_daemon(proc, healthy=False)
+                    return _start_javac_subprocess(args)()
+                _release_daemon(proc, healthy=True)
+                return result
+
+            return finish_daemon
+
+    return _start_javac_subprocess(args)
+
+
+# =========================================================
+# COMPILED CLASS CACHE (SHARED ACROSS WORKERS)
+# =========================================================
+
+COMPILE_CACHE_DIR = Path(SCRATCH_ROOT) / "java_chatbot_cache"
+COMPILE_CACHE_MAX_ENTRIES = 256
+# Staging dirs older than this were abandoned (crashed worker, lost finish())
+STAGING_MAX_AGE = 600
+
+
+def _compile_cache_root() -> Optional[Path]:
+    """The shared cache dir, or None if it is unusable or owned by another user"""
+    try:
+        COMPILE_CACHE_DIR.mkdir(mode=0o700, exist_ok=True)
+        if COMPILE_CACHE_DIR.stat().st_uid != os.getuid():
+            return None
+    except OSError:
+        return None
+    return COMPILE_CACHE_DIR
+
+
+@lru_cache(maxsize=1)
+def _toolchain_fingerprint() -> str:
+    """
+    Identity of the javac binary and flags that produce cached entries.
+    The cache outlives the process (tmpfs survives redeploys), so a JDK
+    upgrade or a JAVAC_FLAGS change must not replay stale diagnostics.
+    """
+    real = os.path.realpath(_JAVAC)
+    st = os.stat(real)
+    ident = "\0".join([real, str(st.st_mtime_ns), str(st.st_size), *JAVAC_FLAGS])
+    return hashlib.sha256(ident.encode("utf-8")).hexdigest()
+
+
+def _evict_compile_cache(root: Path) -> None:
+    """
+    Drop the least recently used entries (by mtime) beyond the limit,
+    and staging dirs abandoned for longer than STAGING_MAX_AGE.
+    """
+    def mtime(path: Path) -> float:
+        try:
+            return path.stat().st_mtime
+        except OSError:
+            return 0.0
+
+    try:
+        children = list(root.iterdir())
+    except OSError:
+        return
+
+    entries = []
+    stale_before = time.time() - STAGING_MAX_AGE
+    for path in children:
+        if path.name.startswith(".staging-"):
+            if mtime(path) < stale_before:
+                shutil.rmtree(path, ignore_errors=True)
+        elif not path.name.startswith("."):
+            entries.append(path)
+
+    if len(entries) <= COMPILE_CACHE_MAX_ENTRIES:
+        return
+    entries.sort(key=mtime)
+    for path in entries[:len(entries) - COMPILE_CACHE_MAX_ENTRIES]:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def start_compile(code: str, class_name: str) -> Callable[[], Tuple[int, str, Path]]:
+    """
+    Start compiling code and return a callable that waits for
+    (returncode, javac output, directory holding the .class files).
+
+    Entries live under COMPILE_CACHE_DIR keyed by sha256 of the toolchain
+    fingerprint, the class name and the source, so every worker process
+    skips javac for code any of them has compiled with the same javac and
+    flags.
+    """
+    root = _compile_cache_root()
+    if root is None:
+        # Shared dir is not ours to trust; fall back to a per-process cache
+        root = _workdir() / "compiled"
+        root.mkdir(exist_ok=True)
+
+    key = hashlib.sha256(_toolchain_fingerprint().encode("ascii"))
+    key.update(class_name.encode("utf-8") + b"\0")
+    key.update(code.encode("utf-8"))
+    entry = root / key.hexdigest()
+    try:
+        meta = json.loads((entry / "meta.json").read_text(encoding="utf-8"))
+        os.utime(entry)  # mark as recently used
+        hit = (meta["returncode"], meta["compile_output"], entry)
+        return lambda: hit
+    except (OSError, ValueError, KeyError):
+        pass
+
+    # Build in a staging dir on the same filesystem, then publish atomically
+    staging = Path(tempfile.mkdtemp(prefix=".staging-", dir=root))
+    try:
+        java_file = staging / f"{class_name}.java"
+        java_file.write_text(code, encoding="utf-8")
+        finish_javac = start_javac(java_file)
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    def finish() -> Tuple[int, str, Path]:
+        try:
+            returncode, raw_output = finish_javac()
+            output = _cap_output(raw_output, MAX_COMPILE_OUTPUT)
+            (staging / "meta.json").write_text(
+                json.dumps({"returncode": returncode, "compile_output": output}),
+                encoding="utf-8"
+            )
+            staging.rename(entry)
+        except OSError:
+            # Usually another worker published the same source first
+            shutil.rmtree(staging, ignore_errors=True)
+            if not entry.exists():
+                raise
+            meta = json.loads((entry / "meta.json").read_text(encoding="utf-8"))
+            returncode, output = meta["returncode"], meta["compile_output"]
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        _evict_compile_cache(root)
+        return returncode, output, entry
+
+    return finish
+
+
+def _cap_output(data: bytes, limit: int = MAX_RUNTIME_OUTPUT) -> str:
+    """
+    Decode process output once, keeping only the head and the tail
+    (where stack traces end up) when it is long.
+    """
+    if len(data) <= limit:
+        return data.decode("utf-8", "replace")
+    half = limit // 2
+    return (
+        data[:half].decode("utf-8", "replace")
+        + "\n...\n"
+        + data[-half:].decode("utf-8", "replace")
+    )
+
+
+def run_program(argv: List[str], timeout: float, limit: int = MAX_RUNTIME_OUTPUT) -> str:
+    """
+    Run the user program with stderr merged into stdout and return its
+    output capped like _cap_output. The pipe is drained as it fills and
+    only the head and a rolling tail are kept, so a print loop costs at
+    most `limit` bytes of memory. Raises subprocess.TimeoutExpired after
+    killing the program.
+    """
+    half = limit // 2
+    head = bytearray()
+    tail = bytearray()
+    total = 0
+    deadline = time.monotonic() + timeout
+
+    with subprocess.Popen(argv, stdout=subprocess.PIPE, stderr=subprocess.STDOUT) as proc:
+        fd = proc.stdout.fileno()
+        with selectors.DefaultSelector() as sel:
+            sel.register(fd, selectors.EVENT_READ)
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not sel.select(remaining):
+                    proc.kill()
+                    raise subprocess.TimeoutExpired(argv, timeout)
+                chunk = os.read(fd, 65536)
+                if not chunk:
+                    break
+                total += len(chunk)
+                room = half - len(head)
+                if room > 0:
+                    head += chunk[:room]
+                    chunk = chunk[room:]
+                tail += chunk
+                if len(tail) > limit - half:
+                    del tail[:len(tail) - (limit - half)]
+
+        try:
+            proc.wait(timeout=max(deadline - time.monotonic(), 0))
+        except subprocess.TimeoutExpired:
+            # Closed its output but kept running
+            proc.kill()
+            raise subprocess.TimeoutExpired(argv, timeout)
+
+    if total <= limit:
+        return (head + tail).decode("utf-8", "replace")
+    return (
+        bytes(head).decode("utf-8", "replace")
+        + "\n...\n"
+        + bytes(tail[-half:]).decode("utf-8", "replace")
+    )
+
 # =========================================================
 # MAIN ANALYZER
 # =========================================================
 
-import subprocess
-import tempfile
-import shutil
-from pathlib import Path
+# Output of programs using these may differ between runs, so never cache them
+_RE_NONDETERMINISTIC = re.compile(
+    r'\b(?:Random|SecureRandom|ThreadLocalRandom|UUID|Thread|Executors?|'
+    r'LocalDate|LocalTime|LocalDateTime|Instant|Clock|Date)\b|'
+    r'Math\.random|currentTimeMillis|nanoTime|getenv'
+)
+
+# Scanner reads that would block on stdin: next(), nextInt(), nextLine()
+_RE_SCANNER_READ = re.compile(r'next(?:Int|Line)?\(\)')
+
+# Fixed issues, built once; callers only read them
+_JAVA_NOT_AVAILABLE = {
+    "id": "java_not_available",
+    "title": "🚫 Java Execution Not Available",
+    "explanation": (
+        "This deployed server does not have Java (javac/java) installed. "
+        "Because of security and platform limits, code execution is disabled."
+    ),
+    "fix_example": (
+        "Run this code locally OR deploy using Docker with OpenJDK installed."
+    ),
+    "detail": "javac/java not found in server environment"
+}
+
+_REQUIRES_INPUT = {
+    "id": "requires_input",
+    "title": "⌨️ Program Requires User Input",
+    "explanation": "Uses Scanner to read user input, which cannot be automated here.",
+    "fix_example": "Replace Scanner with hardcoded values or run locally.",
+    "detail": "Scanner usage detected"
+}
+
+_TIMEOUT_ERROR = {
+    "id": "timeout",
+    "title": "⏱️ Execution Timeout",
+    "explanation": "Program exceeded 5-second limit (possible infinite loop).",
+    "fix_example": "Add proper loop conditions or optimize code.",
+    "detail": "Timeout after 5 seconds"
+}
+
+
+def _dedup(items: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    """Drop repeated ids, keeping the first occurrence of each in order"""
+    unique = {}
+    for item in items:
+        unique.setdefault(item.get("id"), item)
+    return list(unique.values())
+
+
+# Finished results by sha256 of the source; the source itself is not kept
+RESULT_CACHE_SIZE = 512
+_result_cache: "OrderedDict[str, dict]" = OrderedDict()
+_result_lock = threading.Lock()
+
 
 def analyze_java_code(code: str):
     """
     Analyze Java code: compile → run → code smells → ALL issues combined
     (NO duplicates, proper suggestions, SAFE for cloud)
+
+    Results for deterministic programs are memoized by content hash, so
+    re-submitting the same snippet skips javac and java entirely.
+    Timeouts are never memoized.
     """
+    if _RE_NONDETERMINISTIC.search(code):
+        return _analyze_impl(code)
+
+    key = hashlib.sha256(code.encode("utf-8")).hexdigest()
+    with _result_lock:
+        result = _result_cache.get(key)
+        if result is not None:
+            _result_cache.move_to_end(key)
+
+    if result is None:
+        result = _analyze_impl(code)
+        # A timeout depends on machine load, not only on the source
+        timed_out = bool(result["errors"]) and result["errors"][0] is _TIMEOUT_ERROR
+        if not timed_out:
+            with _result_lock:
+                _result_cache[key] = result
+                if len(_result_cache) > RESULT_CACHE_SIZE:
+                    _result_cache.popitem(last=False)
+
+    return {**result, "errors": list(result["errors"])}
+
+
+def _analyze_impl(code: str):
 
     # --------------------------------------------------
     # 0. ENVIRONMENT GUARD (CRITICAL FOR RENDER)
     # --------------------------------------------------
-    if shutil.which("javac") is None or shutil.which("java") is None:
+    if _JAVAC is None or _JAVA is None:
         return {
             "success": False,
             "compile_output": "",
             "runtime_output": "",
-            "errors": [{
-                "id": "java_not_available",
-                "title": "🚫 Java Execution Not Available",
-                "explanation": (
-                    "This deployed server does not have Java (javac/java) installed. "
-                    "Because of security and platform limits, code execution is disabled."
-                ),
-                "fix_example": (
-                    "Run this code locally OR deploy using Docker with OpenJDK installed."
-                ),
-                "detail": "javac/java not found in server environment"
-            }]
+            "errors": [_JAVA_NOT_AVAILABLE]
         }
 
     # --------------------------------------------------
     # 1. Check for input requirement
     # --------------------------------------------------
-    if "Scanner" in code and ("nextInt()" in code or "nextLine()" in code or "next()" in code):
+    if "Scanner" in code and _RE_SCANNER_READ.search(code):
         return {
             "success": False,
             "compile_output": "",
             "runtime_output": "",
-            "errors": [{
-                "id": "requires_input",
-                "title": "⌨️ Program Requires User Input",
-                "explanation": "Uses Scanner to read user input, which cannot be automated here.",
-                "fix_example": "Replace Scanner with hardcoded values or run locally.",
-                "detail": "Scanner usage detected"
-            }]
+            "errors": [_REQUIRES_INPUT]
         }
 
     # --------------------------------------------------
-    # 2. Always detect code smells
+    # 2. Start compiling (or reuse cached classes for this source)
+    # --------------------------------------------------
+    class_name = find_public_class_name(code)
+    finish_compile = start_compile(code, class_name)
+
+    # --------------------------------------------------
+    # 3. Always detect code smells (while javac works)
     # --------------------------------------------------
     code_smells = detect_code_smells(code)
 
     # --------------------------------------------------
-    # 3. Write code to temporary file
+    # 4. Wait for the compiler
     # --------------------------------------------------
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmp_path = Path(tmpdir)
-        class_name = find_public_class_name(code)
-        java_file = tmp_path / f"{class_name}.java"
-        java_file.write_text(code, encoding="utf-8")
+    compile_returncode, compile_output, class_dir = finish_compile()
+
+    # --------------------------------------------------
+    # 5. Compilation failed → ONLY compile errors
+    # --------------------------------------------------
+    if compile_returncode != 0:
+        return {
+            "success": False,
+            "compile_output": compile_output,
+            "runtime_output": "",
+            "errors": _dedup(parse_javac_output(compile_output))
+        }
+
+    # --------------------------------------------------
+    # 6. Run program
+    # --------------------------------------------------
+    try:
+        with _run_slots:
+            runtime_output = run_program(
+                [_JAVA, *RUNTIME_JVM_FLAGS, "-cp", str(class_dir), class_name],
+                timeout=5
+            )
 
         # --------------------------------------------------
-        # 4. Compile
+        # 7. Runtime error analysis
         # --------------------------------------------------
-        compile_proc = subprocess.run(
-            ["javac", str(java_file)],
-            capture_output=True,
-            text=True
-        )
-        compile_output = compile_proc.stdout + compile_proc.stderr
+        runtime_errors = analyze_runtime_output(runtime_output)
 
         # --------------------------------------------------
-        # 5. Compilation failed → ONLY compile errors
+        # 8. Combine runtime + smells (no duplicates)
         # --------------------------------------------------
-        if compile_proc.returncode != 0:
-            compile_errors = parse_javac_output(compile_output)
-
-            unique_errors = []
-            seen_ids = set()
-
-            for err in compile_errors:
-                eid = err.get("id")
-                if eid not in seen_ids:
-                    unique_errors.append(err)
-                    seen_ids.add(eid)
+        all_errors = _dedup(runtime_errors + code_smells)
 
+        if all_errors:
             return {
                 "success": False,
                 "compile_output": compile_output,
-                "runtime_output": "",
-                "errors": unique_errors
-            }
-
-        # --------------------------------------------------
-        # 6. Run program
-        # --------------------------------------------------
-        try:
-            run_proc = subprocess.run(
-                ["java", "-cp", str(tmp_path), class_name],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            runtime_output = run_proc.stdout + run_proc.stderr
-
-            # --------------------------------------------------
-            # 7. Runtime error analysis
-            # --------------------------------------------------
-            runtime_errors = analyze_runtime_output(runtime_output)
-
-            # --------------------------------------------------
-            # 8. Combine runtime + smells (no duplicates)
-            # --------------------------------------------------
-            all_errors = []
-            seen_ids = set()
-
-            for err in runtime_errors:
-                eid = err.get("id")
-                if eid not in seen_ids:
-                    all_errors.append(err)
-                    seen_ids.add(eid)
-
-            for smell in code_smells:
-                sid = smell.get("id")
-                if sid not in seen_ids:
-                    all_errors.append(smell)
-                    seen_ids.add(sid)
-
-            if all_errors:
-                return {
-                    "success": False,
-                    "compile_output": compile_output,
-                    "runtime_output": runtime_output,
-                    "errors": all_errors[:3]
-                }
-
-            # --------------------------------------------------
-            # 9. Perfect execution
-            # --------------------------------------------------
-            return {
-                "success": True,
-                "compile_output": compile_output,
                 "runtime_output": runtime_output,
-                "errors": []
+                "errors": all_errors[:3]
             }
 
         # --------------------------------------------------
-        # 10. Timeout handling
+        # 9. Perfect execution
         # --------------------------------------------------
-        except subprocess.TimeoutExpired:
-            timeout_error = [{
-                "id": "timeout",
-                "title": "⏱️ Execution Timeout",
-                "explanation": "Program exceeded 5-second limit (possible infinite loop).",
-                "fix_example": "Add proper loop conditions or optimize code.",
-                "detail": "Timeout after 5 seconds"
-            }]
-
-            combined = []
-            seen_ids = set()
-
-            for err in timeout_error:
-                combined.append(err)
-                seen_ids.add(err["id"])
-
-            for smell in code_smells:
-                if smell["id"] not in seen_ids:
-                    combined.append(smell)
+        return {
+            "success": True,
+            "compile_output": compile_output,
+            "runtime_output": runtime_output,
+            "errors": []
+        }
 
-            return {
-                "success": False,
-                "compile_output": compile_output,
-                "runtime_output": "Program execution timed out.",
-                "errors": combined
-            }
+    # --------------------------------------------------
+    # 10. Timeout handling
+    # --------------------------------------------------
+    except subprocess.TimeoutExpired:
+        return {
+            "success": False,
+            "compile_output": compile_output,
+            "runtime_output": "Program execution timed out.",
+            "errors": _dedup([_TIMEOUT_ERROR, *code_smells])
+        }
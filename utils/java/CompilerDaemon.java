@@ -0,0 +1,61 @@
+import java.io.BufferedReader;
+import java.io.ByteArrayOutputStream;
+import java.io.IOException;
+import java.io.InputStreamReader;
+import java.io.OutputStream;
+import java.io.PrintStream;
+import java.nio.charset.StandardCharsets;
+
+import javax.tools.JavaCompiler;
+import javax.tools.ToolProvider;
+
+/**
+ * Resident javac used by utils/code_analyzer.py so each compile request
+ * does not pay for a fresh JVM start.
+ *
+ * Protocol (one request at a time):
+ *   stdin:  one line of javac arguments separated by tabs
+ *   stdout: "<exit code> <byte length>\n" followed by the compiler output
+ *
+ * The process exits when stdin is closed.
+ */
+public class CompilerDaemon {
+
+    public static void main(String[] args) throws IOException {
+        JavaCompiler compiler = ToolProvider.getSystemJavaCompiler();
+        if (compiler == null) {
+            System.err.println("No system Java compiler available (JRE only?)");
+            System.exit(1);
+        }
+
+        BufferedReader in = new BufferedReader(
+            new InputStreamReader(System.in, StandardCharsets.UTF_8));
+        OutputStream out = System.out;
+
+        String line;
+        while ((line = in.readLine()) != null) {
+            if (line.isEmpty()) {
+                continue;
+            }
+
+            ByteArrayOutputStream stdout = new ByteArrayOutputStream();
+            ByteArrayOutputStream stderr = new ByteArrayOutputStream();
+            int exitCode;
+            try {
+                exitCode = compiler.run(null, stdout, stderr, line.split("\t"));
+            } catch (RuntimeException e) {
+                exitCode = 4;
+                e.printStackTrace(new PrintStream(stderr, true, "UTF-8"));
+            }
+
+            // Same ordering as the Python side used for javac: stdout, then stderr
+            stdout.write(stderr.toByteArray());
+            byte[] body = stdout.toByteArray();
+
+            out.write((exitCode + " " + body.length + "\n")
+                .getBytes(StandardCharsets.US_ASCII));
+            out.write(body);
+            out.flush();
+        }
+    }
+}
@@ -1,13 +1,23 @@
+import csv
 import joblib
-import pandas as pd
+from functools import lru_cache
+import numpy as np
 from pathlib import Path
+from typing import Dict, List
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 
 
-def load_corpus(path: Path) -> pd.DataFrame:
-    """Load the corpus CSV file containing questions and answers"""
-    return pd.read_csv(path)
+def load_corpus(path: Path) -> Dict[str, List[str]]:
+    """
+    Load the corpus CSV file containing questions and answers as plain
+    column lists, so retrieval can index rows without DataFrame overhead
+    """
+    corpus = {"question": [], "answer": []}
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            corpus["question"].append(row["question"] or "")
+            corpus["answer"].append(row["answer"] or "")
+    return corpus
 
 
 def load_vectorizer(path: Path):
@@ -15,14 +25,16 @@ def load_vectorizer(path: Path):
     return joblib.load(path)
 
 
-def retrieve_answer(vectorizer, tfidf_matrix, corpus_df, query, k=1):
+def retrieve_answer(vectorizer, tfidf_matrix, corpus, query, k=1):
     """
     Retrieve the top k most similar answers from the corpus.
     
     Args:
         vectorizer: Trained TF-IDF vectorizer
         tfidf_matrix: Pre-computed TF-IDF matrix of corpus questions
-        corpus_df: DataFrame containing questions and answers
+            (rows L2-normalized, the TfidfVectorizer default)
+        corpus: Mapping of "question"/"answer" to row-aligned lists,
+            as returned by load_corpus
         query: User's question string
         k: Number of top results to return
     
@@ -30,21 +42,58 @@ def retrieve_answer(vectorizer, tfidf_matrix, corpus_df, query, k=1):
         List of dictionaries with question, answer, and similarity score
     """
     # Transform the query using the same vectorizer
-    q_vec = vectorizer.transform([query])
+    q_vec = vectorizer.transform([query]).astype(tfidf_matrix.dtype, copy=False)
     
-    # Calculate cosine similarity between query and all corpus questions
-    sims = cosine_similarity(q_vec, tfidf_matrix)[0]
+    # Cosine similarity is a plain dot product on L2-normalized TF-IDF rows
+    sims = (tfidf_matrix @ q_vec.T).toarray().ravel()
     
-    # Get indices of top k similar questions
-    top_idx = sims.argsort()[::-1][:k]
+    # Get indices of top k similar questions (partial selection, no full sort)
+    if len(sims) == 0:
+        top_idx = []
+    elif k == 1:
+        top_idx = [int(np.argmax(sims))]
+    elif k < len(sims):
+        part = np.argpartition(-sims, k - 1)[:k]
+        top_idx = part[np.argsort(-sims[part])]
+    else:
+        top_idx = np.argsort(-sims)
     
     # Build result list with question, answer, and score
     results = []
+    questions = corpus["question"]
+    answers = corpus["answer"]
     for i in top_idx:
         results.append({
-            "question": corpus_df.iloc[i]["question"],
-            "answer": corpus_df.iloc[i]["answer"],
+            "question": questions[i],
+            "answer": answers[i],
             "score": float(sims[i])
         })
     
     return results
+
+
+def make_retriever(vectorizer, tfidf_matrix, corpus, maxsize=1024):
+    """
+    Build a cached retrieve function bound to a fixed corpus.
+
+    Repeated questions skip vectorization and scoring entirely. Queries are
+    normalized (lowercased, whitespace collapsed) before the cache lookup,
+    which the TF-IDF tokenizer would do anyway.
+
+    Returns:
+        Function retrieve(query, k=1) with the same result format as
+        retrieve_answer
+    """
+    @lru_cache(maxsize=maxsize)
+    def _cached_retrieve(query_norm, k):
+        return tuple(
+            retrieve_answer(vectorizer, tfidf_matrix, corpus, query_norm, k)
+        )
+
+    def retrieve(query, k=1):
+        query_norm = " ".join(query.lower().split())
+        # Hand out copies so callers cannot mutate cached results
+        return [dict(r) for r in _cached_retrieve(query_norm, k)]
+
+    retrieve.cache_info = _cached_retrieve.cache_info
+    return retrieve